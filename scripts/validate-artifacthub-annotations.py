@@ -9,9 +9,13 @@ This script validates:
 - Valid 'kind' values for changes annotation
 """
 
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
 import sys
-import re
-from pathlib import Path
+from collections.abc import Iterator
 
 try:
     import yaml
@@ -19,18 +23,55 @@ except ImportError:
     print("Error: PyYAML is required. Install with: pip install pyyaml")
     sys.exit(1)
 
+# Prefer the libyaml-backed loader - it parses 5-10x faster than the
+# pure-Python one. Fall back (with a warning) when libyaml is unavailable.
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+    print(
+        "Warning: libyaml not available, falling back to the slower "
+        "pure-Python YAML loader. Install libyaml-dev and reinstall PyYAML.",
+        file=sys.stderr,
+    )
+
+# Optional: fastjsonschema compiles each schema to a specialized
+# function at import time, giving the no-error path straight-line code.
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
 # Characters that require quotes in YAML strings
-SPECIAL_CHARS = re.compile(r'[{}:\[\],&*#?|\-<>=!%@]')
+SPECIAL_CHARS = frozenset('{}:[],&*#?|-<>=!%@')
 
 # Valid kinds for artifacthub.io/changes
-VALID_CHANGE_KINDS = {'added', 'changed', 'deprecated', 'removed', 'fixed', 'security'}
+VALID_CHANGE_KINDS = frozenset({'added', 'changed', 'deprecated', 'removed', 'fixed', 'security'})
+
+# Valid values for artifacthub.io/category
+VALID_CATEGORIES = frozenset({
+    'ai-machine-learning', 'database', 'integration-delivery',
+    'monitoring-logging', 'networking', 'security', 'storage',
+    'streaming-messaging', 'skip-prediction'
+})
+
+# Sorted value listings for error messages, built once per process
+VALID_CHANGE_KINDS_STR = ', '.join(sorted(VALID_CHANGE_KINDS))
+VALID_CATEGORIES_STR = ', '.join(sorted(VALID_CATEGORIES))
+
+# Annotations that must hold a boolean string
+BOOL_ANNOTATIONS = (
+    'artifacthub.io/containsSecurityUpdates',
+    'artifacthub.io/operator',
+    'artifacthub.io/prerelease',
+)
 
 
 def check_special_chars_quoted(value: str, field_path: str) -> list[str]:
     """Check if strings with special characters are properly quoted."""
     errors = []
 
-    if isinstance(value, str) and SPECIAL_CHARS.search(value):
+    if isinstance(value, str) and not SPECIAL_CHARS.isdisjoint(value):
         # The value contains special chars - it should be quoted in the original YAML
         # Since we're parsing after YAML load, we can't check original quoting directly
         # But we can warn about values that NEED quotes
@@ -39,182 +80,162 @@ def check_special_chars_quoted(value: str, field_path: str) -> list[str]:
     return errors
 
 
-def validate_changes(changes_yaml: str, filename: str) -> list[str]:
-    """Validate artifacthub.io/changes annotation."""
-    errors = []
+# Per-annotation schemas for the list-valued annotations:
+# - required: fields every object must carry
+# - allow_str: whether plain strings are accepted as list items
+# - enum: allowed values per field, with the pre-joined listing for errors
+# - non_empty_str: fields that must be non-empty strings
+# - nested: optional list-of-object fields and their required keys
+ANNOTATION_SCHEMAS = {
+    'artifacthub.io/changes': {
+        'required': frozenset({'kind', 'description'}),
+        'allow_str': True,
+        'enum': {'kind': (VALID_CHANGE_KINDS, VALID_CHANGE_KINDS_STR)},
+        'non_empty_str': ('description',),
+        'nested': {'links': frozenset({'name', 'url'})},
+    },
+    'artifacthub.io/images': {
+        'required': frozenset({'image'}),
+    },
+    'artifacthub.io/links': {
+        'required': frozenset({'name', 'url'}),
+    },
+    'artifacthub.io/maintainers': {
+        'required': frozenset({'name', 'email'}),
+    },
+}
+
+
+def _build_json_schema(spec: dict) -> dict:
+    """Translate an annotation schema into an equivalent JSON Schema."""
+    item_schema = {'type': 'object', 'required': sorted(spec.get('required', ()))}
+    properties = {}
+    for field, (allowed, _listing) in spec.get('enum', {}).items():
+        properties[field] = {'enum': sorted(allowed)}
+    for field in spec.get('non_empty_str', ()):
+        # \S mirrors the hand-rolled strip() check: at least one
+        # non-whitespace character
+        properties[field] = {'type': 'string', 'pattern': r'\S'}
+    for field, required_keys in spec.get('nested', {}).items():
+        properties[field] = {
+            'type': 'array',
+            'items': {'type': 'object', 'required': sorted(required_keys)},
+        }
+    if properties:
+        item_schema['properties'] = properties
+    if spec.get('allow_str'):
+        item_schema = {'anyOf': [{'type': 'string'}, item_schema]}
+    return {'type': ['array', 'null'], 'items': item_schema}
+
+
+# Compiled fast-path validators, one per list-valued annotation
+if fastjsonschema is not None:
+    COMPILED_VALIDATORS = {
+        key: fastjsonschema.compile(_build_json_schema(spec))
+        for key, spec in ANNOTATION_SCHEMAS.items()
+    }
+else:
+    COMPILED_VALIDATORS = {}
 
-    try:
-        changes = yaml.safe_load(changes_yaml)
-    except yaml.YAMLError as e:
-        errors.append(f"  artifacthub.io/changes: Invalid YAML syntax - {e}")
-        return errors
 
-    if changes is None:
-        return errors  # Empty is allowed
+def validate_annotation_list(obj, annotation_key: str, spec: dict) -> Iterator[str]:
+    """Yield errors for a decoded list-valued annotation against its schema."""
+    if obj is None:
+        return  # Empty is allowed
 
-    if not isinstance(changes, list):
-        errors.append(f"  artifacthub.io/changes: Must be a list, got {type(changes).__name__}")
-        return errors
+    if not isinstance(obj, list):
+        yield f"  {annotation_key}: Must be a list, got {type(obj).__name__}"
+        return
 
-    for i, change in enumerate(changes):
-        # Simple string format is allowed
-        if isinstance(change, str):
-            continue
+    allow_str = spec.get('allow_str', False)
+    required = spec.get('required', frozenset())
+    enum = spec.get('enum', {})
+    non_empty_str = spec.get('non_empty_str', ())
 
-        if not isinstance(change, dict):
-            errors.append(f"  artifacthub.io/changes[{i}]: Must be a string or object, got {type(change).__name__}")
+    for i, item in enumerate(obj):
+        # Simple string format is allowed for some annotations
+        if isinstance(item, str) and allow_str:
             continue
 
-        # Validate 'kind' field
-        if 'kind' not in change:
-            errors.append(f"  artifacthub.io/changes[{i}]: Missing required field 'kind'")
-        elif change['kind'] not in VALID_CHANGE_KINDS:
-            errors.append(
-                f"  artifacthub.io/changes[{i}]: Invalid kind '{change['kind']}'. "
-                f"Must be one of: {', '.join(sorted(VALID_CHANGE_KINDS))}"
-            )
-
-        # Validate 'description' field
-        if 'description' not in change:
-            errors.append(f"  artifacthub.io/changes[{i}]: Missing required field 'description'")
-        elif not isinstance(change['description'], str):
-            errors.append(f"  artifacthub.io/changes[{i}]: 'description' must be a string")
-        elif not change['description'].strip():
-            errors.append(f"  artifacthub.io/changes[{i}]: 'description' cannot be empty")
-
-        # Validate optional 'links' field
-        if 'links' in change:
-            if not isinstance(change['links'], list):
-                errors.append(f"  artifacthub.io/changes[{i}]: 'links' must be a list")
+        if not isinstance(item, dict):
+            if allow_str:
+                yield f"  {annotation_key}[{i}]: Must be a string or object, got {type(item).__name__}"
             else:
-                for j, link in enumerate(change['links']):
-                    if not isinstance(link, dict):
-                        errors.append(f"  artifacthub.io/changes[{i}].links[{j}]: Must be an object")
-                    elif 'name' not in link or 'url' not in link:
-                        errors.append(f"  artifacthub.io/changes[{i}].links[{j}]: Must have 'name' and 'url'")
-
-    return errors
-
-
-def validate_images(images_yaml: str, filename: str) -> list[str]:
-    """Validate artifacthub.io/images annotation."""
-    errors = []
-
-    try:
-        images = yaml.safe_load(images_yaml)
-    except yaml.YAMLError as e:
-        errors.append(f"  artifacthub.io/images: Invalid YAML syntax - {e}")
-        return errors
-
-    if images is None:
-        return errors
-
-    if not isinstance(images, list):
-        errors.append(f"  artifacthub.io/images: Must be a list, got {type(images).__name__}")
-        return errors
-
-    for i, image in enumerate(images):
-        if not isinstance(image, dict):
-            errors.append(f"  artifacthub.io/images[{i}]: Must be an object")
-            continue
-
-        if 'image' not in image:
-            errors.append(f"  artifacthub.io/images[{i}]: Missing required field 'image'")
-
-    return errors
-
-
-def validate_links(links_yaml: str, filename: str) -> list[str]:
-    """Validate artifacthub.io/links annotation."""
-    errors = []
-
-    try:
-        links = yaml.safe_load(links_yaml)
-    except yaml.YAMLError as e:
-        errors.append(f"  artifacthub.io/links: Invalid YAML syntax - {e}")
-        return errors
-
-    if links is None:
-        return errors
-
-    if not isinstance(links, list):
-        errors.append(f"  artifacthub.io/links: Must be a list, got {type(links).__name__}")
-        return errors
-
-    for i, link in enumerate(links):
-        if not isinstance(link, dict):
-            errors.append(f"  artifacthub.io/links[{i}]: Must be an object")
-            continue
-
-        if 'name' not in link:
-            errors.append(f"  artifacthub.io/links[{i}]: Missing required field 'name'")
-        if 'url' not in link:
-            errors.append(f"  artifacthub.io/links[{i}]: Missing required field 'url'")
-
-    return errors
-
-
-def validate_maintainers(maintainers_yaml: str, filename: str) -> list[str]:
-    """Validate artifacthub.io/maintainers annotation."""
-    errors = []
-
-    try:
-        maintainers = yaml.safe_load(maintainers_yaml)
-    except yaml.YAMLError as e:
-        errors.append(f"  artifacthub.io/maintainers: Invalid YAML syntax - {e}")
-        return errors
-
-    if maintainers is None:
-        return errors
-
-    if not isinstance(maintainers, list):
-        errors.append(f"  artifacthub.io/maintainers: Must be a list, got {type(maintainers).__name__}")
-        return errors
-
-    for i, maintainer in enumerate(maintainers):
-        if not isinstance(maintainer, dict):
-            errors.append(f"  artifacthub.io/maintainers[{i}]: Must be an object")
+                yield f"  {annotation_key}[{i}]: Must be an object"
             continue
 
-        if 'name' not in maintainer:
-            errors.append(f"  artifacthub.io/maintainers[{i}]: Missing required field 'name'")
-        if 'email' not in maintainer:
-            errors.append(f"  artifacthub.io/maintainers[{i}]: Missing required field 'email'")
-
-    return errors
-
-
-def validate_category(category: str, filename: str) -> list[str]:
-    """Validate artifacthub.io/category annotation."""
-    valid_categories = {
-        'ai-machine-learning', 'database', 'integration-delivery',
-        'monitoring-logging', 'networking', 'security', 'storage',
-        'streaming-messaging', 'skip-prediction'
-    }
-
-    if category not in valid_categories:
-        return [f"  artifacthub.io/category: Invalid category '{category}'. Must be one of: {', '.join(sorted(valid_categories))}"]
-
-    return []
+        # One set difference instead of a dict lookup per required field
+        missing = required - item.keys()
+        if missing:
+            fields = ', '.join(f"'{field}'" for field in sorted(missing))
+            yield f"  {annotation_key}[{i}]: Missing required field(s): {fields}"
+
+        for field, (allowed, allowed_str) in enum.items():
+            if field in item and item[field] not in allowed:
+                yield (
+                    f"  {annotation_key}[{i}]: Invalid {field} '{item[field]}'. "
+                    f"Must be one of: {allowed_str}"
+                )
+
+        for field in non_empty_str:
+            if field not in item:
+                continue
+            if not isinstance(item[field], str):
+                yield f"  {annotation_key}[{i}]: '{field}' must be a string"
+            elif not item[field].strip():
+                yield f"  {annotation_key}[{i}]: '{field}' cannot be empty"
+
+        for field, required_keys in spec.get('nested', {}).items():
+            if field not in item:
+                continue
+            if not isinstance(item[field], list):
+                yield f"  {annotation_key}[{i}]: '{field}' must be a list"
+                continue
+            for j, sub in enumerate(item[field]):
+                if not isinstance(sub, dict):
+                    yield f"  {annotation_key}[{i}].{field}[{j}]: Must be an object"
+                elif required_keys - sub.keys():
+                    needed = ' and '.join(f"'{key}'" for key in sorted(required_keys))
+                    yield f"  {annotation_key}[{i}].{field}[{j}]: Must have {needed}"
+
+
+def validate_category(category: str, filename: str) -> Iterator[str]:
+    """Yield errors for the artifacthub.io/category annotation."""
+    # Literal match compiles to a specialized comparison sequence,
+    # skipping the hash lookup a set membership test would do.
+    match category:
+        case ('ai-machine-learning' | 'database' | 'integration-delivery'
+              | 'monitoring-logging' | 'networking' | 'security' | 'storage'
+              | 'streaming-messaging' | 'skip-prediction'):
+            pass
+        case _:
+            yield f"  artifacthub.io/category: Invalid category '{category}'. Must be one of: {VALID_CATEGORIES_STR}"
 
 
 def validate_chart_yaml(filename: str) -> list[str]:
     """Validate a Chart.yaml file for artifacthub.io annotations."""
     errors = []
 
+    # Read raw bytes - the YAML loader decodes UTF-8 internally, so a
+    # separate Python-level decode pass would be wasted work.
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
+        with open(filename, 'rb') as f:
             content = f.read()
     except Exception as e:
         return [f"Error reading file: {e}"]
 
     # First, check for common YAML issues in the raw content
     # Check for tabs (should use spaces)
-    if '\t' in content:
+    if b'\t' in content:
         errors.append("  File contains tabs - use spaces for indentation")
 
+    # Charts without any artifacthub.io annotation have nothing to
+    # validate - a cheap substring test avoids the full YAML parse.
+    if b'artifacthub.io/' not in content:
+        return errors
+
     try:
-        chart = yaml.safe_load(content)
+        chart = yaml.load(content, Loader=SafeLoader)
     except yaml.YAMLError as e:
         errors.append(f"  Invalid YAML syntax: {e}")
         return errors
@@ -231,19 +252,33 @@ def validate_chart_yaml(filename: str) -> list[str]:
     if not annotations:
         return errors  # No annotations to validate
 
-    # Validate each known annotation type
-    validators = {
-        'artifacthub.io/changes': validate_changes,
-        'artifacthub.io/images': validate_images,
-        'artifacthub.io/links': validate_links,
-        'artifacthub.io/maintainers': validate_maintainers,
-    }
-
-    for annotation_key, validator in validators.items():
+    for annotation_key, spec in ANNOTATION_SCHEMAS.items():
         if annotation_key in annotations:
             annotation_value = annotations[annotation_key]
-            if annotation_value is not None:
-                errors.extend(validator(str(annotation_value), filename))
+            if annotation_value is None:
+                continue
+            # Annotation values are usually block-scalar strings embedding
+            # YAML, but inline lists/dicts arrive already decoded - pass
+            # those through without a second parse.
+            if isinstance(annotation_value, (list, dict)):
+                decoded = annotation_value
+            else:
+                try:
+                    decoded = yaml.load(str(annotation_value), Loader=SafeLoader)
+                except yaml.YAMLError as e:
+                    errors.append(f"  {annotation_key}: Invalid YAML syntax - {e}")
+                    continue
+            # Fast path: accept valid values through the compiled schema
+            # validator; only invalid ones take the slower hand-rolled
+            # pass, which produces the detailed per-field messages.
+            compiled = COMPILED_VALIDATORS.get(annotation_key)
+            if compiled is not None:
+                try:
+                    compiled(decoded)
+                    continue
+                except fastjsonschema.JsonSchemaException:
+                    pass
+            errors.extend(validate_annotation_list(decoded, annotation_key, spec))
 
     # Validate category separately (it's a simple string)
     if 'artifacthub.io/category' in annotations:
@@ -251,49 +286,143 @@ def validate_chart_yaml(filename: str) -> list[str]:
         if category:
             errors.extend(validate_category(str(category), filename))
 
-    # Validate boolean string annotations
-    bool_annotations = [
-        'artifacthub.io/containsSecurityUpdates',
-        'artifacthub.io/operator',
-        'artifacthub.io/prerelease',
-    ]
-    for annotation in bool_annotations:
+    # Validate boolean string annotations. The YAML parser usually
+    # delivers these as bool already, so check the type before paying
+    # for a string coercion.
+    for annotation in BOOL_ANNOTATIONS:
         if annotation in annotations:
-            value = str(annotations[annotation]).lower()
-            if value not in ('true', 'false'):
-                errors.append(f"  {annotation}: Must be 'true' or 'false', got '{annotations[annotation]}'")
+            value = annotations[annotation]
+            if isinstance(value, bool):
+                continue
+            if isinstance(value, str) and value.lower() in ('true', 'false'):
+                continue
+            errors.append(f"  {annotation}: Must be 'true' or 'false', got '{value}'")
 
     return errors
 
 
+def _cache_path(cache_dir: str, filename: str) -> str:
+    """Return the cache file path for a given Chart.yaml path."""
+    digest = hashlib.sha256(os.path.abspath(filename).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.json")
+
+
+def _cache_lookup(cache_file: str, stat: os.stat_result) -> list[str] | None:
+    """Return cached errors if the entry matches the file's mtime and size."""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+        errors = entry.get('errors')
+        if isinstance(errors, list):
+            return errors
+
+    return None
+
+
+def _cache_store(cache_file: str, stat: os.stat_result, errors: list[str]) -> None:
+    """Write a cache entry; caching is best-effort, so failures are ignored."""
+    entry = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'errors': errors}
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+    except OSError:
+        pass
+
+
 def main() -> int:
     """Main entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: validate-artifacthub-annotations.py <Chart.yaml> [Chart.yaml ...]")
-        return 1
+    parser = argparse.ArgumentParser(
+        description='Validate artifacthub.io annotations in Chart.yaml files.'
+    )
+    parser.add_argument('files', nargs='*', metavar='Chart.yaml',
+                        help='Chart.yaml files to validate')
+    parser.add_argument('--root', metavar='DIR',
+                        help='discover and validate all Chart.yaml files '
+                             'under this directory')
+    parser.add_argument('--cache-dir', default='.artifacthub-validate-cache',
+                        help='directory for cached validation results '
+                             '(default: %(default)s)')
+    args = parser.parse_args()
+
+    filenames = list(args.files)
+
+    # Walk the tree in-process instead of making the caller expand a
+    # glob through argv - avoids OS argument limits on large repos.
+    if args.root:
+        found = []
+        for dirpath, _dirnames, names in os.walk(args.root):
+            if 'Chart.yaml' in names:
+                found.append(os.path.join(dirpath, 'Chart.yaml'))
+        filenames.extend(sorted(found))
+
+    if not filenames:
+        parser.error('no input files; pass Chart.yaml paths or --root DIR')
 
     exit_code = 0
 
-    for filename in sys.argv[1:]:
-        path = Path(filename)
+    # Collect all output and emit it in one write at the end - per-line
+    # print calls add up when thousands of charts are checked.
+    lines = []
+
+    # Filter the arguments down to existing Chart.yaml files first. The
+    # name check comes before the stat so skipped files cost no syscall,
+    # and the stat doubles as the existence check.
+    files = []
+    stats = {}
+    for filename in filenames:
+        if os.path.basename(filename) != 'Chart.yaml':
+            continue  # Skip non-Chart.yaml files silently
 
-        if not path.exists():
-            print(f"❌ {filename}: File not found")
+        try:
+            stats[filename] = os.stat(filename)
+        except OSError:
+            lines.append(f"❌ {filename}: File not found")
             exit_code = 1
             continue
 
-        if path.name != 'Chart.yaml':
-            continue  # Skip non-Chart.yaml files silently
+        files.append(filename)
+
+    if not files:
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
+        return exit_code
+
+    # Reuse cached results for files unchanged since the last run; an
+    # edit bumps the mtime and invalidates the entry automatically.
+    os.makedirs(args.cache_dir, exist_ok=True)
+    results = {}
+    to_validate = []
+    for filename in files:
+        cached = _cache_lookup(_cache_path(args.cache_dir, filename), stats[filename])
+        if cached is not None:
+            results[filename] = cached
+        else:
+            to_validate.append(filename)
 
-        errors = validate_chart_yaml(filename)
+    # YAML parsing is CPU-bound, so validate the files across a process pool.
+    # A generous chunksize keeps the per-task overhead low for small files.
+    if to_validate:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            validated = list(executor.map(validate_chart_yaml, to_validate, chunksize=8))
 
+        for filename, errors in zip(to_validate, validated):
+            results[filename] = errors
+            _cache_store(_cache_path(args.cache_dir, filename), stats[filename], errors)
+
+    for filename in files:
+        errors = results[filename]
         if errors:
-            print(f"❌ {filename}:")
-            for error in errors:
-                print(error)
+            lines.append(f"❌ {filename}:")
+            lines.extend(errors)
             exit_code = 1
         else:
-            print(f"✅ {filename}: Valid")
+            lines.append(f"✅ {filename}: Valid")
+
+    sys.stdout.write('\n'.join(lines) + '\n')
 
     return exit_code
 